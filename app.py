@@ -2,7 +2,17 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import hashlib
+import io
 import math
+import pyarrow.csv as pa_csv
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels still run as plain Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
 
 # ===============================
 # PAGE CONFIG
@@ -54,19 +64,45 @@ html, body, [class*="css"] {
 # ===============================
 # UTILITIES
 # ===============================
+def hash_password(password):
+    return hashlib.blake2b(password.encode(), digest_size=32).hexdigest()
+
+@st.cache_resource
+def _load_users():
+    df = pd.read_csv("users.csv")
+    return dict(zip(df["username"], df["password"]))
+
+@st.cache_data(show_spinner=False)
+def _csv_columns(file_bytes):
+    return pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+
+@st.cache_data(show_spinner=False)
+def _load_csv(file_bytes, include_columns=None):
+    convert_options = None
+    if include_columns is not None:
+        convert_options = pa_csv.ConvertOptions(include_columns=list(include_columns))
+    table = pa_csv.read_csv(io.BytesIO(file_bytes), convert_options=convert_options)
+    return table.to_pandas()
+
+_DIFF_BINS = np.array([0.20, 0.40, 0.60, 0.80])
+_DIFF_LABELS = np.array([
+    "Very Difficult", "Difficult", "Moderately Difficult", "Easy", "Very Easy"
+])
+_DISC_BINS = np.array([-0.60, -0.20, 0.20, 0.60])
+_DISC_LABELS = np.array([
+    "Questionable", "Not Discriminating", "Moderately Discriminating",
+    "Discriminating", "Very Discriminating"
+])
+_KR_BINS = np.array([0.50, 0.60, 0.70, 0.80, 0.90])
+_KR_LABELS = np.array([
+    "Unacceptable", "Poor", "Questionable", "Acceptable", "Good", "Excellent"
+])
+
 def difficulty_label(p):
-    if p <= 0.20: return "Very Difficult"
-    if p <= 0.40: return "Difficult"
-    if p <= 0.60: return "Moderately Difficult"
-    if p <= 0.80: return "Easy"
-    return "Very Easy"
+    return _DIFF_LABELS[np.searchsorted(_DIFF_BINS, p)]
 
 def discrimination_label(d):
-    if d <= -0.60: return "Questionable"
-    if d <= -0.20: return "Not Discriminating"
-    if d <= 0.20: return "Moderately Discriminating"
-    if d <= 0.60: return "Discriminating"
-    return "Very Discriminating"
+    return _DISC_LABELS[np.searchsorted(_DISC_BINS, d)]
 
 def final_decision(p, d):
     if d >= 0.20 and 0.26 <= p <= 0.75:
@@ -75,25 +111,149 @@ def final_decision(p, d):
         return "Revised"
     return "Rejected"
 
-def kr20(df):
-    k = df.shape[1]
-    if k < 2:
+@njit(cache=True)
+def _kr20_core(arr, row_sums):
+    n, k = arr.shape
+    col_sums = np.zeros(k, np.int64)
+    for i in range(n):
+        for j in range(k):
+            col_sums[j] += arr[i, j]
+    pq = 0.0
+    for j in range(k):
+        p = col_sums[j] / n
+        pq += p * (1.0 - p)
+    mean = 0.0
+    for i in range(n):
+        mean += row_sums[i]
+    mean /= n
+    total_var = 0.0
+    for i in range(n):
+        dev = row_sums[i] - mean
+        total_var += dev * dev
+    total_var /= n - 1
+    if total_var == 0.0:
         return np.nan
-    p = df.mean()
-    q = 1 - p
-    pq = (p * q).sum()
-    total_var = df.sum(axis=1).var(ddof=1)
-    if total_var == 0:
+    return (k / (k - 1)) * (1.0 - pq / total_var)
+
+@njit(cache=True)
+def _row_totals_and_groups(arr, g):
+    n, k = arr.shape
+    totals = np.empty(n, np.int32)
+    for i in range(n):
+        s = 0
+        for j in range(k):
+            s += arr[i, j]
+        totals[i] = s
+    top_idx = np.argpartition(totals, n - g)[n - g:]
+    bot_idx = np.argpartition(totals, g - 1)[:g]
+    return totals, top_idx, bot_idx
+
+@njit(cache=True)
+def _group_sums(arr, top_idx, bot_idx):
+    k = arr.shape[1]
+    U = np.zeros(k, np.int32)
+    L = np.zeros(k, np.int32)
+    for i in top_idx:
+        for j in range(k):
+            U[j] += arr[i, j]
+    for i in bot_idx:
+        for j in range(k):
+            L[j] += arr[i, j]
+    return U, L
+
+def kr20(arr, row_sums=None):
+    n, k = arr.shape
+    if n < 2 or k < 2:
         return np.nan
-    return (k / (k - 1)) * (1 - (pq / total_var))
+    if row_sums is None:
+        row_sums = arr.sum(axis=1, dtype=np.int32)
+    return _kr20_core(arr, row_sums)
 
 def kr_label(alpha):
-    if alpha >= 0.90: return "Excellent"
-    if alpha >= 0.80: return "Good"
-    if alpha >= 0.70: return "Acceptable"
-    if alpha >= 0.60: return "Questionable"
-    if alpha >= 0.50: return "Poor"
-    return "Unacceptable"
+    if np.isnan(alpha):
+        return "Unacceptable"
+    return _KR_LABELS[np.searchsorted(_KR_BINS, alpha, side="right")]
+
+# ===============================
+# ANALYSIS PIPELINE
+# ===============================
+@st.cache_data(max_entries=16, ttl=3600, show_spinner=False)
+def analyze(responses_bytes, key_bytes, g_fraction=0.27):
+    columns = _csv_columns(responses_bytes)
+    item_cols = columns[columns.str.match(r"(?i)^\s*item")].tolist()
+    responses = _load_csv(responses_bytes, tuple(item_cols))
+    key = _load_csv(key_bytes, tuple(item_cols))
+
+    resp_vals = responses.to_numpy()
+    codes, uniques = pd.factorize(resp_vals.ravel())
+    codes = codes.reshape(resp_vals.shape)
+    key_row = key.to_numpy()[0]
+    key_codes = pd.Index(uniques).get_indexer(key_row)
+    # -1 marks missing/unseen values on both sides; keep a blank
+    # response from matching a key answer that never appears.
+    key_codes[key_codes == -1] = -2
+    if len(uniques) < np.iinfo(np.int8).max:
+        codes = codes.astype(np.int8)
+        key_codes = key_codes.astype(np.int8)
+
+    arr = (codes == key_codes).astype(np.int8)
+
+    n = len(arr)
+    g = max(1, math.floor(g_fraction * n))
+    scores, top_idx, bot_idx = _row_totals_and_groups(arr, g)
+
+    U, L = _group_sums(arr, top_idx, bot_idx)
+    p_arr = (U + L) / (2 * g)
+    d_arr = (U - L) / g
+
+    diff_labels = _DIFF_LABELS[np.searchsorted(_DIFF_BINS, p_arr)]
+    disc_labels = _DISC_LABELS[np.searchsorted(_DISC_BINS, d_arr)]
+    in_range = (p_arr >= 0.26) & (p_arr <= 0.75)
+    decisions = np.select(
+        [(d_arr >= 0.20) & in_range, (d_arr < 0.20) & in_range],
+        ["Retained", "Revised"],
+        default="Rejected"
+    )
+
+    results_df = pd.DataFrame({
+        "Item": item_cols,
+        "Difficulty Index (P)": np.round(p_arr, 3),
+        "Difficulty Interpretation": diff_labels,
+        "Discrimination Index (D)": np.round(d_arr, 3),
+        "Discrimination Interpretation": disc_labels,
+        "Final Decision": decisions
+    })
+
+    alpha = kr20(arr, scores)
+    reliability_df = pd.DataFrame({
+        "Measure": [
+            "KR-20 Coefficient",
+            "Reliability Interpretation"
+        ],
+        "Result": [
+            np.round(alpha, 3),
+            kr_label(alpha)
+        ]
+    })
+
+    overall_p = float(p_arr.mean())
+    overall_d = float(d_arr.mean())
+    overall_df = pd.DataFrame({
+        "Index": [
+            "Overall Difficulty Index (P̄)",
+            "Overall Discrimination Index (D̄)"
+        ],
+        "Computed Value": [
+            np.round(overall_p, 3),
+            np.round(overall_d, 3)
+        ],
+        "Interpretation": [
+            difficulty_label(overall_p),
+            discrimination_label(overall_d)
+        ]
+    })
+
+    return results_df, reliability_df, overall_df
 
 # ===============================
 # PUBLIC LANDING PAGE
@@ -143,8 +303,12 @@ def login_page():
     password = st.text_input("Password", type="password")
 
     if st.button("Login"):
-        st.session_state.logged_in = True
-        st.rerun()
+        users = _load_users()
+        if users.get(username) == hash_password(password):
+            st.session_state.logged_in = True
+            st.rerun()
+        else:
+            st.error("Invalid username or password.")
 
 # ===============================
 # MAIN APPLICATION
@@ -191,40 +355,9 @@ def main_app():
     key_file = st.file_uploader("UPLOAD ANSWER KEY (CSV)", type="csv")
 
     if responses_file and key_file:
-        responses = pd.read_csv(responses_file)
-        key = pd.read_csv(key_file)
-
-        item_cols = [c for c in responses.columns if c.lower().startswith("item")]
-        responses = responses[item_cols]
-        key = key[item_cols]
-
-        scored = (responses == key.iloc[0]).astype(int)
-        scores = scored.sum(axis=1)
-        scored["Total"] = scores
-        scored = scored.sort_values("Total", ascending=False)
-
-        n = len(scored)
-        g = max(1, math.floor(0.27 * n))
-        top = scored.head(g)
-        bottom = scored.tail(g)
-
-        results = []
-        for item in item_cols:
-            U = top[item].sum()
-            L = bottom[item].sum()
-            p = (U + L) / (2 * g)
-            d = (U - L) / g
-            results.append({
-                "Item": item,
-                "Difficulty Index (P)": round(p, 3),
-                "Difficulty Interpretation": difficulty_label(p),
-                "Discrimination Index (D)": round(d, 3),
-                "Discrimination Interpretation": discrimination_label(d),
-                "Final Decision": final_decision(p, d)
-            })
-
-        df = pd.DataFrame(results)
-        alpha = kr20(scored[item_cols])
+        df, reliability_df, overall_df = analyze(
+            responses_file.getvalue(), key_file.getvalue()
+        )
 
         st.markdown("### ITEM ANALYSIS RESULTS")
         st.markdown(
@@ -250,48 +383,12 @@ def main_app():
         st.dataframe(df, use_container_width=True)
 
         st.markdown("### Test Reliability")
-
-        reliability_df = pd.DataFrame({
-            "Measure": [
-                "KR-20 Coefficient",
-                "Reliability Interpretation"
-            ],
-            "Result": [
-                round(alpha, 3),
-                kr_label(alpha)
-            ]
-        })
-
         st.dataframe(reliability_df, use_container_width=True)
 
         # ===============================
         # OVERALL ITEM INDEX SUMMARY
         # ===============================
         st.markdown("### Overall Item Index Summary")
-
-        overall_p = sum(
-            item["Difficulty Index (P)"] for item in results
-        ) / len(results)
-
-        overall_d = sum(
-            item["Discrimination Index (D)"] for item in results
-        ) / len(results)
-
-        overall_df = pd.DataFrame({
-            "Index": [
-                "Overall Difficulty Index (P̄)",
-                "Overall Discrimination Index (D̄)"
-            ],
-            "Computed Value": [
-                round(overall_p, 3),
-                round(overall_d, 3)
-            ],
-            "Interpretation": [
-                difficulty_label(overall_p),
-                discrimination_label(overall_d)
-            ]
-        })
-
         st.dataframe(overall_df, use_container_width=True)
     
 